@@ -0,0 +1,2 @@
+# Start the startup clock before anything else in the app is imported
+from app.utils import startup_profile  # noqa: F401
\ No newline at end of file
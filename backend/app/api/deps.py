@@ -1,12 +1,14 @@
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
+from typing import Optional
+from fastapi import Depends, HTTPException, Security, status
+from fastapi.security import APIKeyHeader, OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.user import User
-from app.utils.security import decode_access_token
+from app.utils.security import decode_access_token, get_sensor_id
 from app.services.auth_service import get_user_by_username
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
+sensor_api_key_scheme = APIKeyHeader(name="X-API-Key", auto_error=False)
 
 
 def get_current_user(
@@ -34,4 +36,15 @@ def get_current_user(
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
 
-    return user
\ No newline at end of file
+    return user
+
+
+def get_current_sensor(api_key: Optional[str] = Security(sensor_api_key_scheme)) -> str:
+    sensor_id = get_sensor_id(api_key) if api_key else None
+    if sensor_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or missing sensor API key",
+            headers={"WWW-Authenticate": "ApiKey"},
+        )
+    return sensor_id
\ No newline at end of file
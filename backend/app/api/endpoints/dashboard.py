@@ -0,0 +1,18 @@
+from fastapi import APIRouter, HTTPException
+from app.schemas.dashboard import DashboardSummary
+from app.services.dashboard_service import dashboard_summary
+
+router = APIRouter()
+
+
+@router.get("/summary", response_model=DashboardSummary)
+async def get_summary():
+    """Precomputed dashboard KPIs; age_seconds tells how stale the snapshot is."""
+    snapshot = dashboard_summary.current()
+    if snapshot is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Dashboard summary not ready yet",
+            headers={"Retry-After": "1"},
+        )
+    return snapshot
\ No newline at end of file
@@ -1,13 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.api.deps import get_current_sensor
 from app.schemas.detection_event import DetectionEventsCreate, DetectionEvents
 from app.services.detection_service import create_detection_event, get_detection_events
 
 router = APIRouter()
 
 
-@router.post("")
+@router.post("", dependencies=[Depends(get_current_sensor)])
 def create_event(event: DetectionEventsCreate, db: Session = Depends(get_db)):
     try:
         create_detection_event(db, event)
@@ -17,5 +18,5 @@ def create_event(event: DetectionEventsCreate, db: Session = Depends(get_db)):
 
 
 @router.get("", response_model=list[DetectionEvents])
-def get_events(db: Session = Depends(get_db)):
+def get_events(db: Session = Depends(get_read_db)):
     return get_detection_events(db)
\ No newline at end of file
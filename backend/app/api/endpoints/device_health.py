@@ -1,13 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.api.deps import get_current_sensor
 from app.schemas.device_health import DeviceHealthLogsCreate, DeviceHealthLogs
 from app.services.device_health_service import create_device_health_log, get_device_health_logs
 
 router = APIRouter()
 
 
-@router.post("")
+@router.post("", dependencies=[Depends(get_current_sensor)])
 def create_health_log(log: DeviceHealthLogsCreate, db: Session = Depends(get_db)):
     try:
         create_device_health_log(db, log)
@@ -17,5 +18,5 @@ def create_health_log(log: DeviceHealthLogsCreate, db: Session = Depends(get_db)
 
 
 @router.get("", response_model=list[DeviceHealthLogs])
-def get_health_logs(db: Session = Depends(get_db)):
+def get_health_logs(db: Session = Depends(get_read_db)):
     return get_device_health_logs(db)
\ No newline at end of file
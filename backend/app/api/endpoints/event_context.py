@@ -1,13 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.api.deps import get_current_sensor
 from app.schemas.event_context import EventContextCreate, EventContext
 from app.services.event_context_service import create_event_context, get_event_context
 
 router = APIRouter()
 
 
-@router.post("")
+@router.post("", dependencies=[Depends(get_current_sensor)])
 def create_context(context: EventContextCreate, db: Session = Depends(get_db)):
     try:
         create_event_context(db, context)
@@ -17,5 +18,5 @@ def create_context(context: EventContextCreate, db: Session = Depends(get_db)):
 
 
 @router.get("", response_model=list[EventContext])
-def get_contexts(db: Session = Depends(get_db)):
+def get_contexts(db: Session = Depends(get_read_db)):
     return get_event_context(db)
\ No newline at end of file
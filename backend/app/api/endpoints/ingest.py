@@ -0,0 +1,122 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.config import MAX_INGEST_BODY_BYTES
+from app.database import get_db
+from app.api.deps import get_current_sensor
+from app.schemas.detection_event import DetectionEventsCreate
+from app.schemas.traffic_features import TrafficFeaturesCreate
+from app.schemas.ingest import SensorBatchCreate, DetectionCompositeCreate
+from app.services.ingest_service import create_sensor_batch, create_detection_composites
+
+router = APIRouter()
+
+MSGPACK_CONTENT_TYPES = ("application/msgpack", "application/x-msgpack")
+
+# msgpack record kind -> (batch field, schema)
+MSGPACK_RECORDS = {
+    "detection_event": ("detection_events", DetectionEventsCreate),
+    "traffic_features": ("traffic_features", TrafficFeaturesCreate),
+}
+
+
+def _conflict() -> HTTPException:
+    # Sensors pick their own ids, so a retry after a lost response resends rows that already exist
+    return HTTPException(status_code=409, detail="Conflicts with existing records; nothing was ingested")
+
+
+async def _read_msgpack_batch(request: Request) -> SensorBatchCreate:
+    """Decode a stream of [kind, fields] msgpack records as the body arrives."""
+    import msgpack  # only loaded once a sensor actually sends msgpack
+
+    batch = SensorBatchCreate()
+    unpacker = msgpack.Unpacker(raw=False, timestamp=3, max_buffer_size=MAX_INGEST_BODY_BYTES)
+    index = 0
+    async for chunk in request.stream():
+        try:
+            unpacker.feed(chunk)
+            for record in unpacker:
+                kind, fields = record
+                field, schema = MSGPACK_RECORDS[kind]
+                try:
+                    getattr(batch, field).append(schema.model_validate(fields))
+                except ValidationError as e:
+                    raise RequestValidationError(
+                        [{**err, "loc": ("body", index, *err["loc"])} for err in e.errors(include_url=False)]
+                    )
+                index += 1
+        except (ValueError, TypeError, KeyError, msgpack.UnpackException):
+            raise HTTPException(status_code=400, detail=f"Malformed msgpack record at index {index}")
+    # read_bytes refuses to run while a record is half-decoded, which is how a cut-off body shows up
+    try:
+        trailing = unpacker.read_bytes(1)
+    except ValueError:
+        trailing = True
+    if trailing:
+        raise HTTPException(status_code=400, detail=f"Truncated msgpack record at index {index}")
+    return batch
+
+
+@router.post("/batch")
+async def ingest_batch(
+    request: Request,
+    sensor_id: str = Depends(get_current_sensor),
+    db: Session = Depends(get_db),
+):
+    """Ingest detection events and traffic features in one request.
+
+    Accepts a JSON SensorBatchCreate, or with Content-Type application/msgpack a
+    stream of [kind, fields] records where kind is "detection_event" or
+    "traffic_features". Either may be gzip or zstd compressed. Only msgpack is
+    decoded as it streams in; a JSON body is collected (up to
+    MAX_INGEST_BODY_BYTES) into one buffer and parsed once.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type in MSGPACK_CONTENT_TYPES:
+        batch = await _read_msgpack_batch(request)
+    else:
+        body = bytearray()
+        async for chunk in request.stream():
+            body += chunk
+        try:
+            batch = SensorBatchCreate.model_validate_json(body)
+        except ValidationError as e:
+            raise RequestValidationError(e.errors(include_url=False))
+
+    try:
+        await run_in_threadpool(create_sensor_batch, db, batch)
+    except IntegrityError:
+        raise _conflict()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return {
+        "message": f"Ingested {len(batch.detection_events)} detection events "
+        f"and {len(batch.traffic_features)} traffic features from {sensor_id}",
+    }
+
+
+@router.post("/detections", dependencies=[Depends(get_current_sensor)])
+def ingest_detection(detection: DetectionCompositeCreate, db: Session = Depends(get_db)):
+    """Ingest one detection event with its traffic features, context and logs atomically."""
+    try:
+        event_ids = create_detection_composites(db, [detection])
+    except IntegrityError:
+        raise _conflict()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return {"message": "Detection successfully ingested!", "event_id": event_ids[0]}
+
+
+@router.post("/detections/batch", dependencies=[Depends(get_current_sensor)])
+def ingest_detections(detections: list[DetectionCompositeCreate], db: Session = Depends(get_db)):
+    """Ingest many detections, each with its children, in a single transaction."""
+    try:
+        event_ids = create_detection_composites(db, detections)
+    except IntegrityError:
+        raise _conflict()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return {"message": f"Ingested {len(event_ids)} detections", "event_ids": event_ids}
\ No newline at end of file
@@ -1,13 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.api.deps import get_current_sensor
 from app.schemas.system_log import SystemLogsCreate, SystemLogs
 from app.services.system_log_service import create_system_log, get_system_logs
 
 router = APIRouter()
 
 
-@router.post("")
+@router.post("", dependencies=[Depends(get_current_sensor)])
 def create_log(log: SystemLogsCreate, db: Session = Depends(get_db)):
     try:
         create_system_log(db, log)
@@ -17,5 +18,5 @@ def create_log(log: SystemLogsCreate, db: Session = Depends(get_db)):
 
 
 @router.get("", response_model=list[SystemLogs])
-def get_logs(db: Session = Depends(get_db)):
+def get_logs(db: Session = Depends(get_read_db)):
     return get_system_logs(db)
\ No newline at end of file
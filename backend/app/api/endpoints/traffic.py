@@ -1,13 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.api.deps import get_current_sensor
 from app.schemas.traffic_features import TrafficFeaturesCreate, TrafficFeatures
 from app.services.traffic_service import create_traffic_features, get_traffic_features
 
 router = APIRouter()
 
 
-@router.post("")
+@router.post("", dependencies=[Depends(get_current_sensor)])
 def create_features(features: TrafficFeaturesCreate, db: Session = Depends(get_db)):
     try:
         create_traffic_features(db, features)
@@ -17,5 +18,5 @@ def create_features(features: TrafficFeaturesCreate, db: Session = Depends(get_d
 
 
 @router.get("", response_model=list[TrafficFeatures])
-def get_features(db: Session = Depends(get_db)):
+def get_features(db: Session = Depends(get_read_db)):
     return get_traffic_features(db)
\ No newline at end of file
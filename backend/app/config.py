@@ -0,0 +1,69 @@
+import os
+from dotenv import load_dotenv
+
+# The only place .env is read; every other module imports its settings from here
+load_dotenv()
+
+# Database
+DB_USER = os.getenv("POSTGRES_USER", "postgres")
+DB_PASSWORD = os.getenv("POSTGRES_PASSWORD", "postgres")
+DB_HOST = os.getenv("POSTGRES_HOST", "localhost")
+DB_NAME = os.getenv("POSTGRES_DB", "iot_soc_db")
+# Seconds to wait for a TCP connection, so an unreachable host fails fast instead of
+# stalling startup for the OS connect timeout
+DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", "5"))
+# Run create_all and the table check in the lifespan hook; disable when migrations run separately
+DB_INIT_ON_STARTUP = os.getenv("DB_INIT_ON_STARTUP", "true").lower() in ("1", "true", "yes")
+
+# Read replicas, comma-separated hosts, e.g. "replica1:5432,replica2:5432"
+DB_REPLICA_HOSTS = [h.strip() for h in os.getenv("POSTGRES_REPLICA_HOSTS", "").split(",") if h.strip()]
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+REPLICA_HEALTH_CHECK_INTERVAL = float(os.getenv("REPLICA_HEALTH_CHECK_INTERVAL", "5"))
+REPLICA_CONNECT_TIMEOUT = int(os.getenv("REPLICA_CONNECT_TIMEOUT", "2"))
+# Reads from a client that wrote within this window go to the primary (0 disables)
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "0"))
+
+# Auth
+SECRET_KEY = os.getenv("SECRET_KEY", "fallback-secret-key-change-this")
+ALGORITHM = os.getenv("ALGORITHM", "HS256")
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "480"))
+# Comma-separated "sensor_id:api_key" pairs
+SENSOR_API_KEYS = os.getenv("SENSOR_API_KEYS", "")
+
+# Rate limiting and admission control
+# Per-role limits, overridable as RATE_LIMIT_<ROLE>_RPS / RATE_LIMIT_<ROLE>_BURST
+ROLE_RATE_LIMITS = {
+    role: (
+        float(os.getenv(f"RATE_LIMIT_{role.upper()}_RPS", str(rps))),
+        int(os.getenv(f"RATE_LIMIT_{role.upper()}_BURST", str(burst))),
+    )
+    for role, (rps, burst) in {
+        "super_admin": (50.0, 100),
+        "security_admin": (50.0, 100),
+        "operator": (20.0, 40),
+        "analyst": (20.0, 40),
+    }.items()
+}
+RATE_LIMIT_SENSOR_RPS = float(os.getenv("RATE_LIMIT_SENSOR_RPS", "50"))
+RATE_LIMIT_SENSOR_BURST = int(os.getenv("RATE_LIMIT_SENSOR_BURST", "200"))
+RATE_LIMIT_ANONYMOUS_RPS = float(os.getenv("RATE_LIMIT_ANONYMOUS_RPS", "5"))
+RATE_LIMIT_ANONYMOUS_BURST = int(os.getenv("RATE_LIMIT_ANONYMOUS_BURST", "10"))
+MAX_CONCURRENT_INGEST = int(os.getenv("MAX_CONCURRENT_INGEST", "32"))
+MAX_CONCURRENT_READ = int(os.getenv("MAX_CONCURRENT_READ", "16"))
+MAX_CONCURRENT_AUTH = int(os.getenv("MAX_CONCURRENT_AUTH", "8"))
+# Optional shared backend so limits hold across workers
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "")
+
+# Ingest
+MAX_INGEST_BODY_BYTES = int(os.getenv("MAX_INGEST_BODY_BYTES", str(32 * 1024 * 1024)))
+
+# Dashboard
+DASHBOARD_REFRESH_SECONDS = float(os.getenv("DASHBOARD_REFRESH_SECONDS", "5"))
+# Full recompute of today's KPIs, a backstop for rows committed long after insert
+DASHBOARD_FULL_RECOMPUTE_SECONDS = float(os.getenv("DASHBOARD_FULL_RECOMPUTE_SECONDS", "300"))
+
+# CORS
+FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
+
+# Startup time budget (process start to first request), reported in /health
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "2000"))
\ No newline at end of file
@@ -1,27 +1,205 @@
-from sqlalchemy import create_engine, inspect
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from dotenv import load_dotenv
-import os
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from fastapi import Request
+from starlette.datastructures import MutableHeaders
+from typing import Optional
+import asyncio
+import itertools
+import math
+import threading
+import time
 
-# Load .env file
-load_dotenv()
-
-DB_USER = os.getenv("POSTGRES_USER", "postgres")
-DB_PASSWORD = os.getenv("POSTGRES_PASSWORD", "postgres")
-DB_HOST = os.getenv("POSTGRES_HOST", "localhost")
-DB_NAME = os.getenv("POSTGRES_DB", "iot_soc_db")
+from app.config import (
+    DB_USER,
+    DB_PASSWORD,
+    DB_HOST,
+    DB_NAME,
+    DB_CONNECT_TIMEOUT,
+    DB_REPLICA_HOSTS,
+    REPLICA_MAX_LAG_SECONDS,
+    REPLICA_HEALTH_CHECK_INTERVAL,
+    REPLICA_CONNECT_TIMEOUT,
+    READ_YOUR_WRITES_SECONDS,
+)
 
 SQLALCHEMY_DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}"
+REPLICA_DATABASE_URLS = [f"postgresql://{DB_USER}:{DB_PASSWORD}@{host}/{DB_NAME}" for host in DB_REPLICA_HOSTS]
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, pool_pre_ping=True)
+# Engines connect on first checkout, so importing this module never touches the database
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    pool_pre_ping=True,
+    connect_args={"connect_timeout": DB_CONNECT_TIMEOUT},
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Seconds of replay lag; 0 when the replica has applied everything it received.
+# NULL when nothing is streaming from the primary: replay then stops at the last
+# received LSN and would otherwise look fully caught up while falling behind.
+# Reading pg_stat_wal_receiver.status needs pg_read_all_stats (or superuser).
+REPLICATION_LAG_SQL = text(
+    "SELECT CASE "
+    "WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReplicaRouter:
+    """Round-robin over read replicas, skipping ones that are down or lagging.
+
+    Health and lag are checked by run_replica_health_checks() in the background;
+    a replica is not used until its first check passes.
+    """
+
+    def __init__(self, urls: list[str], max_lag: float, check_interval: float):
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.replicas = []
+        for url in urls:
+            replica_engine = create_engine(
+                url,
+                pool_pre_ping=True,
+                connect_args={"connect_timeout": REPLICA_CONNECT_TIMEOUT},
+            )
+            self.replicas.append({
+                "engine": replica_engine,
+                "sessionmaker": sessionmaker(autocommit=False, autoflush=False, bind=replica_engine),
+                "healthy": False,
+                "lag": None,
+            })
+        self._cycle = itertools.cycle(range(len(self.replicas)))
+        self._lock = threading.Lock()
+
+    def check(self, replica: dict):
+        """Measure a replica's replay lag and mark it healthy if within bounds."""
+        try:
+            with replica["engine"].connect() as conn:
+                lag = conn.execute(REPLICATION_LAG_SQL).scalar()
+        except Exception as e:
+            print(f"Read replica {replica['engine'].url.host} unavailable: {e}")
+            self.mark_down(replica)
+            return
+        if lag is None:
+            print(f"Read replica {replica['engine'].url.host} is not streaming from the primary")
+            self.mark_down(replica)
+            return
+        replica["lag"] = float(lag)
+        replica["healthy"] = replica["lag"] <= self.max_lag
+
+    def mark_down(self, replica: dict):
+        replica["healthy"] = False
+        replica["lag"] = None
+
+    def pick(self) -> Optional[dict]:
+        """Next healthy replica, or None if none qualify."""
+        for _ in range(len(self.replicas)):
+            with self._lock:
+                replica = self.replicas[next(self._cycle)]
+            if replica["healthy"]:
+                return replica
+        return None
+
+    def get_sessionmaker(self):
+        """Next healthy replica's sessionmaker, or the primary's if none qualify."""
+        replica = self.pick()
+        return replica["sessionmaker"] if replica else SessionLocal
+
+    def status(self):
+        return [
+            {"host": r["engine"].url.host, "healthy": r["healthy"], "lag_seconds": r["lag"]}
+            for r in self.replicas
+        ]
+
+
+replica_router = ReplicaRouter(REPLICA_DATABASE_URLS, REPLICA_MAX_LAG_SECONDS, REPLICA_HEALTH_CHECK_INTERVAL)
+
+
+async def run_replica_health_checks():
+    """Background loop that keeps replica health and lag current, off the request path."""
+    while True:
+        for replica in replica_router.replicas:
+            await asyncio.to_thread(replica_router.check, replica)
+        await asyncio.sleep(replica_router.check_interval)
+
+
+# The client carries the time of its last write, so whichever worker serves its next read can honour it
+WRITE_COOKIE = "last_write"
+
+
+@event.listens_for(Session, "after_commit")
+def _flag_commit(session):
+    request = session.info.get("request")
+    if request is not None:
+        request.state.last_write = time.time()
+
 
-def get_db():
-    """Dependency for getting database session."""
+def _wrote_recently(request: Request) -> bool:
+    try:
+        written_at = float(request.cookies.get(WRITE_COOKIE, ""))
+    except ValueError:
+        return False
+    return time.time() - written_at < READ_YOUR_WRITES_SECONDS
+
+
+class ReadYourWritesMiddleware:
+    """Set the last-write cookie on responses to requests that committed on the primary."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or READ_YOUR_WRITES_SECONDS <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        # Created here so middlewares that copy the scope further in still share it
+        state = scope.setdefault("state", {})
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and "last_write" in state:
+                MutableHeaders(scope=message).append(
+                    "set-cookie",
+                    f"{WRITE_COOKIE}={state['last_write']:.3f}; Max-Age={math.ceil(READ_YOUR_WRITES_SECONDS)}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
+def get_db(request: Request):
+    """Dependency for getting a primary (read-write) database session."""
     db = SessionLocal()
+    if READ_YOUR_WRITES_SECONDS > 0:
+        db.info["request"] = request
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db(request: Request):
+    """Dependency for getting a read-only session, routed to a replica when possible."""
+    replica = None
+    if replica_router.replicas and not (READ_YOUR_WRITES_SECONDS > 0 and _wrote_recently(request)):
+        replica = replica_router.pick()
+
+    db = None
+    if replica is not None:
+        db = replica["sessionmaker"]()
+        try:
+            # Check out a connection now so a replica that died since its last check falls back
+            db.connection()
+        except OperationalError as e:
+            print(f"Read replica {replica['engine'].url.host} failed, using primary: {e}")
+            db.close()
+            replica_router.mark_down(replica)
+            db = None
+    if db is None:
+        db = SessionLocal()
     try:
         yield db
     finally:
@@ -32,6 +210,28 @@ def init_db():
     """Create all tables and verify they exist."""
     Base.metadata.create_all(bind=engine)
 
+    # create_all does not add columns to existing tables. Adding one with a volatile
+    # default would rewrite the table under an exclusive lock, so it is added with a
+    # constant default (existing rows get the ALTER's time, no rewrite) and switched
+    # to clock_timestamp() for new rows afterwards. Skipped once the column exists,
+    # so later startups take no table lock at all.
+    columns = {c["name"] for c in inspect(engine).get_columns("detection_events")}
+    if "ingested_at" not in columns:
+        with engine.begin() as conn:
+            conn.execute(text(
+                "ALTER TABLE detection_events "
+                "ADD COLUMN IF NOT EXISTS ingested_at TIMESTAMPTZ NOT NULL DEFAULT now()"
+            ))
+            conn.execute(text(
+                "ALTER TABLE detection_events ALTER COLUMN ingested_at SET DEFAULT clock_timestamp()"
+            ))
+    # CONCURRENTLY keeps inserts flowing while the index builds; it cannot run in a transaction
+    with engine.execution_options(isolation_level="AUTOCOMMIT").connect() as conn:
+        conn.execute(text(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_detection_events_ingested_at "
+            "ON detection_events (ingested_at)"
+        ))
+
     inspector = inspect(engine)
     existing_tables = inspector.get_table_names()
 
@@ -45,4 +245,4 @@ def init_db():
     ]
 
     created_tables = [table for table in required_tables if table in existing_tables]
-    return created_tables
\ No newline at end of file
+    return created_tables
@@ -1,18 +1,18 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from dotenv import load_dotenv
-import os
 
-from app.database import init_db
+from app.config import FRONTEND_URL, DB_INIT_ON_STARTUP, STARTUP_BUDGET_MS
+from app.database import ReadYourWritesMiddleware, init_db, replica_router, run_replica_health_checks
+from app.api.deps import get_current_user
+from app.utils.rate_limit import RateLimitMiddleware
+from app.utils.content_encoding import DecompressionMiddleware
+from app.utils.startup_profile import FirstRequestMiddleware, mark, startup_report
 
-# Import all models so SQLAlchemy registers them with Base.metadata
-# This is critical — without these imports, init_db() won't create the tables
-from app.models.user import User
-from app.models.detection_event import DetectionEvents
-from app.models.traffic_features import TrafficFeatures
-from app.models.event_context import EventContext
-from app.models.device_health import DeviceHealthLogs
-from app.models.system_log import SystemLogs
+# Registers every model with Base.metadata so init_db() creates all tables
+from app import models  # noqa: F401
 
 # Import routers
 from app.api.endpoints import auth
@@ -21,12 +21,32 @@ from app.api.endpoints import traffic
 from app.api.endpoints import event_context
 from app.api.endpoints import device_health
 from app.api.endpoints import system_logs
+from app.api.endpoints import ingest
+from app.api.endpoints import dashboard
+from app.services.dashboard_service import run_dashboard_refresh
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The database is first contacted here, not at import, so workers import even when it is down
+    if DB_INIT_ON_STARTUP:
+        try:
+            created_tables = await asyncio.to_thread(init_db)
+            if created_tables:
+                print(f"Database initialized. Tables: {', '.join(created_tables)}")
+        except Exception as e:
+            print(f"Error initializing database: {e}")
 
-# Load env
-load_dotenv()
+    replica_health = asyncio.create_task(run_replica_health_checks())
+    dashboard_refresh = asyncio.create_task(run_dashboard_refresh())
+    mark("ready")
+    yield
+    for task in (dashboard_refresh, replica_health):
+        task.cancel()
+    for task in (dashboard_refresh, replica_health):
+        with suppress(asyncio.CancelledError):
+            await task
 
-# Initialize database and create tables
-init_db()
 
 app = FastAPI(
     title="IoT SOC Dashboard API",
@@ -34,11 +54,19 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    lifespan=lifespan,
 )
 
-# CORS
-FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
+# gzip/zstd request bodies, decompressed as they stream in
+app.add_middleware(DecompressionMiddleware)
+
+# Marks clients that just wrote, so their reads skip replicas on every worker
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Rate limiting and admission control (added before CORS so rejections still carry CORS headers)
+app.add_middleware(RateLimitMiddleware)
 
+# CORS
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[FRONTEND_URL],
@@ -47,6 +75,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so it times the whole first request
+app.add_middleware(FirstRequestMiddleware, budget_ms=STARTUP_BUDGET_MS)
+
 # Include routers
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
 app.include_router(detection.router, prefix="/api/v1/detection-events", tags=["detection-events"])
@@ -54,23 +85,26 @@ app.include_router(traffic.router, prefix="/api/v1/traffic-features", tags=["tra
 app.include_router(event_context.router, prefix="/api/v1/event-context", tags=["event-context"])
 app.include_router(device_health.router, prefix="/api/v1/device-health-logs", tags=["device-health-logs"])
 app.include_router(system_logs.router, prefix="/api/v1/system-logs", tags=["system-logs"])
+app.include_router(ingest.router, prefix="/api/v1/ingest", tags=["ingest"])
+app.include_router(dashboard.router, prefix="/api/v1/dashboard", tags=["dashboard"])
 
-
-# Startup event
-@app.on_event("startup")
-async def startup_event():
-    try:
-        created_tables = init_db()
-        if created_tables:
-            print(f"Database initialized. Tables: {', '.join(created_tables)}")
-    except Exception as e:
-        print(f"Error initializing database: {e}")
+mark("app_created")
 
 
 # Health check
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "service": "IoT SOC Dashboard API"}
+    return {
+        "status": "healthy",
+        "service": "IoT SOC Dashboard API",
+        "startup": startup_report(STARTUP_BUDGET_MS),
+    }
+
+
+# Replica hosts and lag are internal topology, so unlike /health this needs a login
+@app.get("/health/replicas", dependencies=[Depends(get_current_user)])
+def replica_health():
+    return {"read_replicas": replica_router.status()}
 
 
 @app.get("/")
@@ -0,0 +1,8 @@
+# Importing the package registers every model with Base.metadata, so relationships
+# resolve and init_db() sees all tables regardless of which model a caller imports first
+from app.models.user import User
+from app.models.detection_event import DetectionEvents
+from app.models.traffic_features import TrafficFeatures
+from app.models.event_context import EventContext
+from app.models.device_health import DeviceHealthLogs
+from app.models.system_log import SystemLogs
\ No newline at end of file
@@ -16,6 +16,8 @@ class DetectionEvents(Base):
     severity = Column(String(50), nullable=False)
     model_name = Column(String(100), nullable=False)
     processing_latency_ms = Column(Float, nullable=False)
+    # Server-side insert time; timestamp is client-supplied and sensors may upload late
+    ingested_at = Column(TIMESTAMP(timezone=True), server_default=func.clock_timestamp(), nullable=False, index=True)
 
     # Relationships
     traffic_features = relationship("TrafficFeatures", back_populates="detection_event", cascade="all, delete-orphan")
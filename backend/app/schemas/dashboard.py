@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+from app.schemas.device_health import DeviceHealthLogs
+
+
+class DashboardSummary(BaseModel):
+    events_today: int
+    critical_today: int
+    avg_detection_latency_ms: Optional[float] = None
+    active_sources: int
+    latest_device_health: Optional[DeviceHealthLogs] = None
+    computed_at: datetime
+    age_seconds: float
\ No newline at end of file
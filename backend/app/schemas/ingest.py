@@ -0,0 +1,34 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from uuid import UUID
+from datetime import datetime
+from app.schemas.detection_event import DetectionEventsCreate
+from app.schemas.traffic_features import TrafficFeaturesBase, TrafficFeaturesCreate
+from app.schemas.event_context import EventContextBase
+from app.schemas.system_log import SystemLogsBase
+
+
+class SensorBatchCreate(BaseModel):
+    detection_events: list[DetectionEventsCreate] = Field(default_factory=list)
+    traffic_features: list[TrafficFeaturesCreate] = Field(default_factory=list)
+
+
+# --- Composite ingest: children take their event_id from the enclosing event ---
+
+class TrafficFeaturesNested(TrafficFeaturesBase):
+    feature_id: Optional[UUID] = None
+
+
+class EventContextNested(EventContextBase):
+    context_id: Optional[UUID] = None
+
+
+class SystemLogsNested(SystemLogsBase):
+    log_id: Optional[UUID] = None
+    timestamp: Optional[datetime] = None
+
+
+class DetectionCompositeCreate(DetectionEventsCreate):
+    traffic_features: list[TrafficFeaturesNested] = Field(default_factory=list)
+    event_context: list[EventContextNested] = Field(default_factory=list)
+    system_logs: list[SystemLogsNested] = Field(default_factory=list)
\ No newline at end of file
@@ -0,0 +1,118 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy import distinct, func, select
+from sqlalchemy.orm import Session
+from app.config import DASHBOARD_REFRESH_SECONDS, DASHBOARD_FULL_RECOMPUTE_SECONDS, REPLICA_MAX_LAG_SECONDS
+from app.database import replica_router
+from app.models.detection_event import DetectionEvents
+from app.models.device_health import DeviceHealthLogs
+from app.models.traffic_features import TrafficFeatures
+from app.schemas.device_health import DeviceHealthLogs as DeviceHealthLogsSchema
+
+# Sources seen in traffic for events within this window count as active
+ACTIVE_SOURCE_WINDOW = timedelta(minutes=15)
+# Rows are folded in once they are this old, so inserts still committing (or
+# replicating) when the cursor passes them are not skipped
+INGEST_SETTLE = timedelta(seconds=5 + REPLICA_MAX_LAG_SECONDS)
+
+
+class DashboardSummaryCache:
+    """Today's KPIs as running totals, advanced by an ingested_at cursor.
+
+    Each refresh only aggregates rows inserted since the previous one, whatever
+    their (client-supplied) event timestamp, so late uploads are still counted.
+    The whole day is recomputed on rollover and every DASHBOARD_FULL_RECOMPUTE_SECONDS.
+    """
+
+    def __init__(self):
+        self._day: Optional[datetime] = None
+        self._cursor: Optional[datetime] = None
+        self._full_at = 0.0
+        # [event count, critical count, latency sum] for events stamped today
+        self._totals = [0, 0, 0.0]
+        self._snapshot: Optional[dict] = None
+        self._computed_at = 0.0
+
+    def _db_now(self, db: Session) -> datetime:
+        return db.execute(select(func.now())).scalar_one()
+
+    def _aggregate(self, db: Session, day_start: datetime, after: Optional[datetime], until: datetime):
+        """Totals for events stamped today and ingested in (after, until]."""
+        query = select(
+            func.count(),
+            func.count().filter(func.lower(DetectionEvents.severity) == "critical"),
+            func.coalesce(func.sum(DetectionEvents.processing_latency_ms), 0.0),
+        ).where(DetectionEvents.timestamp >= day_start, DetectionEvents.ingested_at <= until)
+        if after is not None:
+            query = query.where(DetectionEvents.ingested_at > after)
+        count, critical, latency_sum = db.execute(query).one()
+        return count, critical, float(latency_sum)
+
+    def refresh(self, db: Session):
+        now = datetime.now(timezone.utc)
+        day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        until = self._db_now(db) - INGEST_SETTLE
+
+        full = self._day != day_start or time.monotonic() - self._full_at >= DASHBOARD_FULL_RECOMPUTE_SECONDS
+        if full:
+            self._totals = list(self._aggregate(db, day_start, None, until))
+            self._day = day_start
+            self._full_at = time.monotonic()
+            self._cursor = until
+        elif until > self._cursor:
+            for i, delta in enumerate(self._aggregate(db, day_start, self._cursor, until)):
+                self._totals[i] += delta
+            self._cursor = until
+
+        events, critical, latency_total = self._totals
+
+        latest_health = db.execute(
+            select(DeviceHealthLogs).order_by(DeviceHealthLogs.timestamp.desc()).limit(1)
+        ).scalar_one_or_none()
+
+        active_sources = db.execute(
+            select(func.count(distinct(TrafficFeatures.src_ip)))
+            .join(DetectionEvents, TrafficFeatures.event_id == DetectionEvents.event_id)
+            .where(DetectionEvents.timestamp >= now - ACTIVE_SOURCE_WINDOW)
+        ).scalar_one()
+
+        self._snapshot = {
+            "events_today": events,
+            "critical_today": critical,
+            "avg_detection_latency_ms": latency_total / events if events else None,
+            "active_sources": active_sources,
+            "latest_device_health": (
+                DeviceHealthLogsSchema.model_validate(latest_health) if latest_health else None
+            ),
+            "computed_at": now,
+        }
+        self._computed_at = time.monotonic()
+
+    def current(self) -> Optional[dict]:
+        """Latest snapshot with its age, or None before the first refresh."""
+        if self._snapshot is None:
+            return None
+        return {**self._snapshot, "age_seconds": time.monotonic() - self._computed_at}
+
+
+dashboard_summary = DashboardSummaryCache()
+
+
+def refresh_dashboard_summary():
+    db = replica_router.get_sessionmaker()()
+    try:
+        dashboard_summary.refresh(db)
+    finally:
+        db.close()
+
+
+async def run_dashboard_refresh():
+    """Background loop that keeps the dashboard summary snapshot fresh."""
+    while True:
+        try:
+            await asyncio.to_thread(refresh_dashboard_summary)
+        except Exception as e:
+            print(f"Dashboard summary refresh failed: {e}")
+        await asyncio.sleep(DASHBOARD_REFRESH_SECONDS)
\ No newline at end of file
@@ -0,0 +1,36 @@
+import uuid
+from sqlalchemy.orm import Session
+from app.models.detection_event import DetectionEvents
+from app.models.traffic_features import TrafficFeatures
+from app.models.event_context import EventContext
+from app.models.system_log import SystemLogs
+from app.schemas.ingest import SensorBatchCreate, DetectionCompositeCreate
+
+COMPOSITE_CHILDREN = {"traffic_features", "event_context", "system_logs"}
+
+
+def create_sensor_batch(db: Session, batch: SensorBatchCreate):
+    """Insert a batch in one transaction; events are flushed before the features that reference them."""
+    db.add_all(DetectionEvents(**e.model_dump(exclude_unset=True)) for e in batch.detection_events)
+    db.add_all(TrafficFeatures(**f.model_dump(exclude_unset=True)) for f in batch.traffic_features)
+    db.commit()
+
+
+def _build_detection_graph(detection: DetectionCompositeCreate) -> DetectionEvents:
+    payload = detection.model_dump(exclude_unset=True, exclude=COMPOSITE_CHILDREN)
+    # Assign the id up front so callers can report it without a refresh after commit
+    payload["event_id"] = detection.event_id or uuid.uuid4()
+    db_event = DetectionEvents(**payload)
+    db_event.traffic_features = [TrafficFeatures(**tf.model_dump(exclude_unset=True)) for tf in detection.traffic_features]
+    db_event.event_context = [EventContext(**ctx.model_dump(exclude_unset=True)) for ctx in detection.event_context]
+    db_event.system_logs = [SystemLogs(**log.model_dump(exclude_unset=True)) for log in detection.system_logs]
+    return db_event
+
+
+def create_detection_composites(db: Session, detections: list[DetectionCompositeCreate]) -> list[uuid.UUID]:
+    """Insert events with their features, context and logs in a single transaction."""
+    db_events = [_build_detection_graph(d) for d in detections]
+    event_ids = [e.event_id for e in db_events]
+    db.add_all(db_events)
+    db.commit()
+    return event_ids
\ No newline at end of file
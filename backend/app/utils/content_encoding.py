@@ -0,0 +1,225 @@
+import zlib
+
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+
+from app.config import MAX_INGEST_BODY_BYTES
+
+
+def _too_large():
+    return HTTPException(status_code=413, detail="Request body too large")
+
+
+def _truncated():
+    return HTTPException(status_code=400, detail="Truncated compressed body")
+
+
+class _GzipDecoder:
+    def __init__(self):
+        self._obj = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    def decompress(self, data: bytes, limit: int) -> bytes:
+        out = self._obj.decompress(data, limit + 1)
+        if self._obj.unconsumed_tail:
+            raise _too_large()
+        return out
+
+    def flush(self) -> bytes:
+        out = self._obj.flush()
+        if not self._obj.eof:
+            raise _truncated()
+        if self._obj.unused_data:
+            raise HTTPException(status_code=400, detail="Unexpected data after compressed body")
+        return out
+
+
+class _LimitedSink:
+    """Collects zstd output and aborts decompression once it passes the limit."""
+
+    def __init__(self):
+        self.chunks: list[bytes] = []
+        self.size = 0
+        self.limit = 0
+
+    def write(self, data) -> int:
+        self.size += len(data)
+        if self.size > self.limit:
+            raise _too_large()
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def take(self) -> bytes:
+        out = b"".join(self.chunks)
+        self.chunks.clear()
+        self.size = 0
+        return out
+
+
+class _ZstdFrameTracker:
+    """Follows zstd frame and block headers to tell whether input ended on a frame boundary.
+
+    The stream writer does not report where a frame ends, and decompressobj()
+    cannot bound its output, so the headers are walked separately. Block
+    contents are skipped over, never inspected.
+    """
+
+    MAGIC = 0xFD2FB528
+    SKIPPABLE_MAGIC = 0x184D2A50
+
+    def __init__(self):
+        self.frames = 0
+        self._state = "magic"
+        self._need = 4
+        self._header = bytearray()
+        self._skip = 0
+        self._checksum = False
+
+    @property
+    def complete(self) -> bool:
+        return self.frames > 0 and self._state == "magic" and not self._header and not self._skip
+
+    def feed(self, data: bytes):
+        view = memoryview(data)
+        pos = 0
+        while pos < len(view):
+            if self._skip:
+                step = min(self._skip, len(view) - pos)
+                self._skip -= step
+                pos += step
+                continue
+            take = min(self._need - len(self._header), len(view) - pos)
+            self._header += view[pos:pos + take]
+            pos += take
+            if len(self._header) == self._need:
+                self._advance(int.from_bytes(self._header, "little"))
+                self._header.clear()
+
+    def _advance(self, field: int):
+        if self._state == "magic":
+            if field == self.MAGIC:
+                self._state, self._need = "descriptor", 1
+            elif field & 0xFFFFFFF0 == self.SKIPPABLE_MAGIC:
+                self._state, self._need = "skippable", 4
+            else:
+                raise ValueError("Not a zstd frame")
+        elif self._state == "skippable":
+            self._skip = field
+            self._state, self._need = "magic", 4
+        elif self._state == "descriptor":
+            content_size_flag, single_segment = field >> 6, (field >> 5) & 1
+            self._checksum = bool(field & 0x04)
+            # Window descriptor, dictionary id and frame content size follow the descriptor
+            self._skip = (
+                (0 if single_segment else 1)
+                + (0, 1, 2, 4)[field & 0x03]
+                + ((1 if single_segment else 0), 2, 4, 8)[content_size_flag]
+            )
+            self._state, self._need = "block", 3
+        else:
+            last, block_type, size = field & 1, (field >> 1) & 3, field >> 3
+            # RLE blocks carry a single byte regardless of their size field
+            self._skip = 1 if block_type == 1 else size
+            if last:
+                self._skip += 4 if self._checksum else 0
+                self.frames += 1
+                self._state, self._need = "magic", 4
+
+
+class _ZstdDecoder:
+    def __init__(self):
+        import zstandard
+
+        # The writer hands output to the sink block by block, so an oversized
+        # chunk is rejected after at most one extra block rather than fully inflated
+        self._sink = _LimitedSink()
+        self._writer = zstandard.ZstdDecompressor().stream_writer(self._sink)
+        self._frames = _ZstdFrameTracker()
+
+    def decompress(self, data: bytes, limit: int) -> bytes:
+        self._frames.feed(data)
+        self._sink.limit = limit
+        self._writer.write(data)
+        return self._sink.take()
+
+    def flush(self) -> bytes:
+        if not self._frames.complete:
+            raise _truncated()
+        return b""
+
+
+DECODERS = {
+    b"gzip": _GzipDecoder,
+    b"zstd": _ZstdDecoder,
+}
+
+
+class DecompressionMiddleware:
+    """Decompress gzip/zstd request bodies chunk by chunk as the app reads them.
+
+    Every request body, compressed or not, is capped at MAX_INGEST_BODY_BYTES.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = None
+        content_length = None
+        for name, value in scope["headers"]:
+            if name == b"content-encoding":
+                encoding = value.strip().lower()
+            elif name == b"content-length" and value.isdigit():
+                content_length = int(value)
+
+        if content_length is not None and content_length > MAX_INGEST_BODY_BYTES:
+            await self._reject(scope, receive, send, 413, "Request body too large")
+            return
+
+        decoder = None
+        if encoding not in (None, b"identity"):
+            decoder_cls = DECODERS.get(encoding)
+            try:
+                decoder = decoder_cls() if decoder_cls else None
+            except ImportError:
+                decoder = None
+            if decoder is None:
+                await self._reject(scope, receive, send, 415, "Unsupported Content-Encoding")
+                return
+
+            # The app sees a plain body of unknown length
+            scope = dict(scope)
+            scope["headers"] = [
+                (n, v) for n, v in scope["headers"] if n not in (b"content-encoding", b"content-length")
+            ]
+
+        received = 0
+
+        async def receive_limited():
+            nonlocal received
+            message = await receive()
+            if message["type"] != "http.request":
+                return message
+            body = message.get("body", b"")
+            if decoder is not None:
+                try:
+                    body = decoder.decompress(body, MAX_INGEST_BODY_BYTES - received)
+                    if not message.get("more_body", False):
+                        body += decoder.flush()
+                except HTTPException:
+                    raise
+                except Exception:
+                    raise HTTPException(status_code=400, detail="Malformed compressed body")
+            received += len(body)
+            if received > MAX_INGEST_BODY_BYTES:
+                raise _too_large()
+            return {**message, "body": body}
+
+        await self.app(scope, receive_limited, send)
+
+    async def _reject(self, scope, receive, send, status_code: int, detail: str):
+        response = JSONResponse(status_code=status_code, content={"detail": detail})
+        await response(scope, receive, send)
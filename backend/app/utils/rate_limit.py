@@ -0,0 +1,225 @@
+import hashlib
+import math
+import threading
+import time
+from typing import Optional
+
+from starlette.responses import JSONResponse
+
+from app.config import (
+    ROLE_RATE_LIMITS,
+    RATE_LIMIT_SENSOR_RPS,
+    RATE_LIMIT_SENSOR_BURST,
+    RATE_LIMIT_ANONYMOUS_RPS,
+    RATE_LIMIT_ANONYMOUS_BURST,
+    MAX_CONCURRENT_INGEST,
+    MAX_CONCURRENT_READ,
+    MAX_CONCURRENT_AUTH,
+    RATE_LIMIT_REDIS_URL,
+)
+from app.utils.security import decode_access_token, get_sensor_id
+
+# Token bucket limits as (requests per second, burst size)
+SENSOR_RATE_LIMIT = (RATE_LIMIT_SENSOR_RPS, RATE_LIMIT_SENSOR_BURST)
+ANONYMOUS_RATE_LIMIT = (RATE_LIMIT_ANONYMOUS_RPS, RATE_LIMIT_ANONYMOUS_BURST)
+
+# In-flight request caps per route class
+CONCURRENCY_LIMITS = {
+    "ingest": MAX_CONCURRENT_INGEST,
+    "read": MAX_CONCURRENT_READ,
+    "auth": MAX_CONCURRENT_AUTH,
+}
+CONCURRENCY_RETRY_AFTER = 1
+
+_MAX_BUCKETS = 10000
+_MAX_CACHED_TOKENS = 1000
+
+
+class InMemoryTokenBuckets:
+    """Per-process token buckets keyed by client identity."""
+
+    def __init__(self):
+        # key -> [tokens, last update, seconds to refill completely]
+        self._buckets: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+
+    async def hit(self, key: str, rate: float, burst: int) -> tuple[bool, float]:
+        """Take one token; return (allowed, seconds until a token is available)."""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= _MAX_BUCKETS:
+                    self._prune(now)
+                bucket = self._buckets[key] = [float(burst), now, burst / rate]
+            tokens = min(burst, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            if tokens >= 1:
+                bucket[0] = tokens - 1
+                return True, 0.0
+            bucket[0] = tokens
+            return False, (1 - tokens) / rate
+
+    def _prune(self, now: float):
+        """Drop buckets idle long enough to have refilled, each by its own refill time."""
+        for key in [k for k, b in self._buckets.items() if now - b[1] > b[2]]:
+            del self._buckets[key]
+        # Everything is mid-refill: evict the oldest buckets so the cap still holds
+        while len(self._buckets) >= _MAX_BUCKETS:
+            del self._buckets[next(iter(self._buckets))]
+
+
+class RedisTokenBuckets:
+    """Token buckets shared between workers through Redis."""
+
+    SCRIPT = """
+    local rate = tonumber(ARGV[1])
+    local burst = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or burst
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+    local allowed = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, url: str, fallback: InMemoryTokenBuckets):
+        import redis.asyncio as redis
+
+        self._client = redis.from_url(url)
+        self._script = self._client.register_script(self.SCRIPT)
+        self._fallback = fallback
+        # Set while Redis is failing, so an outage is logged once rather than per request
+        self._down = False
+
+    async def hit(self, key: str, rate: float, burst: int) -> tuple[bool, float]:
+        try:
+            allowed, tokens = await self._script(keys=[f"ratelimit:{key}"], args=[rate, burst, time.time()])
+        except Exception as e:
+            if not self._down:
+                self._down = True
+                print(f"Rate limit backend unavailable, using in-process limits: {e}")
+            return await self._fallback.hit(key, rate, burst)
+        if self._down:
+            self._down = False
+            print("Rate limit backend recovered")
+        if int(allowed):
+            return True, 0.0
+        return False, (1 - float(tokens)) / rate
+
+
+def _create_buckets():
+    local = InMemoryTokenBuckets()
+    if not RATE_LIMIT_REDIS_URL:
+        return local
+    try:
+        return RedisTokenBuckets(RATE_LIMIT_REDIS_URL, local)
+    except ImportError:
+        print("RATE_LIMIT_REDIS_URL is set but redis is not installed; using in-process limits")
+        return local
+
+
+buckets = _create_buckets()
+
+# token digest -> decoded claims, so each JWT is verified once rather than per request.
+# Keyed by digest so the bearer tokens themselves are never kept in memory.
+_token_claims: dict[bytes, dict] = {}
+
+
+def _claims_for(token: str) -> Optional[dict]:
+    digest = hashlib.sha256(token.encode("latin-1")).digest()
+    claims = _token_claims.get(digest)
+    if claims is None:
+        claims = decode_access_token(token)
+        if claims is None:
+            return None
+        if len(_token_claims) >= _MAX_CACHED_TOKENS:
+            _token_claims.clear()
+        _token_claims[digest] = claims
+    elif claims.get("exp", 0) < time.time():
+        _token_claims.pop(digest, None)
+        return None
+    return claims
+
+
+def route_class(method: str, path: str) -> Optional[str]:
+    """Bucket an API request into a route class, or None for unlimited paths."""
+    if method == "OPTIONS" or not path.startswith("/api/"):
+        return None
+    if path.startswith("/api/v1/auth"):
+        return "auth"
+    if method == "GET":
+        return "read"
+    return "ingest"
+
+
+def identify(scope, cls: str) -> tuple[str, float, int]:
+    """Return the bucket key and (rate, burst) for the caller of a request."""
+    headers = dict(scope["headers"])
+
+    if cls == "ingest":
+        api_key = headers.get(b"x-api-key")
+        sensor_id = get_sensor_id(api_key.decode("latin-1")) if api_key else None
+        if sensor_id:
+            return f"sensor:{sensor_id}", *SENSOR_RATE_LIMIT
+
+    auth = headers.get(b"authorization", b"")
+    if auth[:7].lower() == b"bearer ":
+        claims = _claims_for(auth[7:].decode("latin-1"))
+        if claims and claims.get("sub"):
+            role = claims.get("role", "")
+            return f"user:{claims['sub']}", *ROLE_RATE_LIMITS.get(role, ANONYMOUS_RATE_LIMIT)
+
+    client = scope.get("client")
+    return f"ip:{client[0] if client else ''}", *ANONYMOUS_RATE_LIMIT
+
+
+class RateLimitMiddleware:
+    """Reject over-limit callers with 429 and saturated route classes with 503."""
+
+    def __init__(self, app):
+        self.app = app
+        self.in_flight = {cls: 0 for cls in CONCURRENCY_LIMITS}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        cls = route_class(scope["method"], scope["path"])
+        if cls is None:
+            await self.app(scope, receive, send)
+            return
+
+        key, rate, burst = identify(scope, cls)
+        allowed, retry_after = await buckets.hit(key, rate, burst)
+        if not allowed:
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": "Rate limit exceeded"},
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
+            await response(scope, receive, send)
+            return
+
+        if self.in_flight[cls] >= CONCURRENCY_LIMITS[cls]:
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "Server busy, try again shortly"},
+                headers={"Retry-After": str(CONCURRENCY_RETRY_AFTER)},
+            )
+            await response(scope, receive, send)
+            return
+
+        self.in_flight[cls] += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight[cls] -= 1
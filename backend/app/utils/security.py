@@ -2,14 +2,26 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional
 from jose import JWTError, jwt
 import bcrypt
-import os
-from dotenv import load_dotenv
+import hashlib
+from app.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, SENSOR_API_KEYS
 
-load_dotenv()
 
-SECRET_KEY = os.getenv("SECRET_KEY", "fallback-secret-key-change-this")
-ALGORITHM = os.getenv("ALGORITHM", "HS256")
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "480"))
+def hash_api_key(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+def _load_sensor_api_keys(raw: str) -> dict[str, str]:
+    """Parse comma-separated "sensor_id:api_key" pairs into {key digest: sensor_id}."""
+    keys = {}
+    for entry in raw.split(","):
+        sensor_id, _, api_key = entry.strip().partition(":")
+        if sensor_id and api_key:
+            keys[hash_api_key(api_key)] = sensor_id
+    return keys
+
+
+# Sensor credentials are held in memory as SHA-256 digests; ingest never hits the DB to authenticate
+SENSOR_KEY_DIGESTS = _load_sensor_api_keys(SENSOR_API_KEYS)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -40,4 +52,9 @@ def decode_access_token(token: str) -> Optional[dict]:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         return payload
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+
+
+def get_sensor_id(api_key: str) -> Optional[str]:
+    """Return the sensor that owns an API key, or None if the key is unknown."""
+    return SENSOR_KEY_DIGESTS.get(hash_api_key(api_key))
\ No newline at end of file
@@ -0,0 +1,76 @@
+import os
+import time
+from typing import Optional
+
+# perf_counter when the app package started importing; every mark is relative to it
+_import_started = time.perf_counter()
+_marks: dict[str, float] = {}
+
+
+def _process_age_ms() -> Optional[float]:
+    """Milliseconds since the process started, from /proc (Linux only)."""
+    try:
+        with open("/proc/self/stat") as f:
+            # Fields after the "(comm)" entry; starttime is field 22 overall
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return (uptime - start_ticks / os.sysconf("SC_CLK_TCK")) * 1000
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+# Interpreter startup and anything imported before the app package
+_preamble_ms = _process_age_ms()
+
+
+def mark(name: str):
+    """Record the first time a startup milestone is reached."""
+    _marks.setdefault(name, (time.perf_counter() - _import_started) * 1000)
+
+
+def startup_report(budget_ms: Optional[float] = None) -> dict:
+    """Milestones in ms since the app package started importing.
+
+    total_ms runs to first_request, or to ready before any request has
+    arrived, plus the interpreter preamble when /proc is available; total_from
+    names the milestone used.
+    """
+    report = {"preamble_ms": _preamble_ms, **{f"{name}_ms": ms for name, ms in _marks.items()}}
+    last = next((name for name in ("first_request", "ready") if name in _marks), None)
+    if last is not None:
+        report["total_ms"] = _marks[last] + (_preamble_ms or 0.0)
+        report["total_from"] = last
+        if budget_ms is not None:
+            report["budget_ms"] = budget_ms
+            report["over_budget"] = report["total_ms"] > budget_ms
+    return report
+
+
+class FirstRequestMiddleware:
+    """Mark when the first HTTP request arrives and its response starts, then stay out of the way.
+
+    first_request is marked on entry so the first response can already report it.
+    """
+
+    def __init__(self, app, budget_ms: Optional[float] = None):
+        self.app = app
+        self.budget_ms = budget_ms
+        self.seen = False
+
+    async def __call__(self, scope, receive, send):
+        if self.seen or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        mark("first_request")
+
+        async def send_marking(message):
+            if message["type"] == "http.response.start" and not self.seen:
+                self.seen = True
+                mark("first_response")
+                report = startup_report(self.budget_ms)
+                print(f"Startup report: {report}")
+            await send(message)
+
+        await self.app(scope, receive, send_marking)
\ No newline at end of file
@@ -0,0 +1,105 @@
+"""Measure backend cold start: per-module import cost and time to first request.
+
+Run from the backend directory:
+
+    python scripts/startup_report.py [--top 20] [--budget-ms 2000]
+
+Starts a fresh interpreter with ``-X importtime``, imports ``app.main``, runs
+the lifespan hook and serves one ``GET /health``. Exits with status 1 when
+time to first request exceeds the budget (STARTUP_BUDGET_MS by default), so
+it can gate CI.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import asyncio, json
+from app.main import app
+from app.config import STARTUP_BUDGET_MS
+from app.utils.startup_profile import startup_report
+
+async def probe():
+    async with app.router.lifespan_context(app):
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": "GET", "scheme": "http", "path": "/health", "raw_path": b"/health",
+            "root_path": "", "query_string": b"", "headers": [],
+            "client": ("127.0.0.1", 0), "server": ("127.0.0.1", 80),
+        }
+        messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+        async def receive():
+            return messages.pop() if messages else {"type": "http.disconnect"}
+
+        async def send(message):
+            pass
+
+        await app(scope, receive, send)
+
+asyncio.run(probe())
+print("STARTUP_REPORT " + json.dumps(startup_report(STARTUP_BUDGET_MS)))
+"""
+
+
+def parse_importtime(stderr: str):
+    """Yield (module, self_us, cumulative_us, depth) from -X importtime output."""
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        yield name.strip(), int(self_us), int(cumulative_us), depth
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=20, help="number of packages to list")
+    parser.add_argument("--budget-ms", type=float, help="override STARTUP_BUDGET_MS")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if args.budget_ms is not None:
+        env["STARTUP_BUDGET_MS"] = str(args.budget_ms)
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    report_line = next(
+        (line for line in result.stdout.splitlines() if line.startswith("STARTUP_REPORT ")), None
+    )
+    if result.returncode != 0 or report_line is None:
+        sys.stderr.write(result.stderr[-4000:])
+        sys.exit(result.returncode or 1)
+    report = json.loads(report_line[len("STARTUP_REPORT "):])
+
+    # Self time summed by top-level package shows which dependency to make lazy
+    by_package = defaultdict(int)
+    for name, self_us, _, _ in parse_importtime(result.stderr):
+        by_package[name.split(".")[0]] += self_us
+
+    print(f"{'package':<30} {'self ms':>10}")
+    for package, self_us in sorted(by_package.items(), key=lambda kv: -kv[1])[:args.top]:
+        print(f"{package:<30} {self_us / 1000:>10.1f}")
+    print()
+    print(f"{'milestone':<30} {'ms':>10}")
+    for key, value in report.items():
+        if key.endswith("_ms") and value is not None:
+            print(f"{key[:-3]:<30} {value:>10.1f}")
+
+    if report.get("over_budget"):
+        print(f"\nOver budget: {report['total_ms']:.0f} ms to {report['total_from']} > {report['budget_ms']:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import models  # noqa: F401
+from app.database import Base
+
+
+@pytest.fixture
+def db_sessionmaker():
+    """Sessions on a fresh in-memory SQLite database with every table created."""
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+
+    @event.listens_for(engine, "connect")
+    def _postgres_compat(dbapi_connection, connection_record):
+        # ingested_at defaults to Postgres' clock_timestamp()
+        dbapi_connection.create_function(
+            "clock_timestamp", 0, lambda: datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")
+        )
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
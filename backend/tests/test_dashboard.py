@@ -0,0 +1,146 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import models
+from app.api.endpoints import dashboard
+from app.services import dashboard_service
+from app.services.dashboard_service import DashboardSummaryCache
+
+
+class FakeEvents:
+    """Rows as (event timestamp, ingested_at, severity, latency)."""
+
+    def __init__(self):
+        self.rows = []
+
+    def aggregate(self, db, day_start, after, until):
+        rows = [
+            r for r in self.rows
+            if r[0] >= day_start and r[1] <= until and (after is None or r[1] > after)
+        ]
+        return len(rows), sum(r[2] == "critical" for r in rows), sum(r[3] for r in rows)
+
+
+def test_late_uploads_are_counted_by_ingest_time():
+    events = FakeEvents()
+    cache = DashboardSummaryCache()
+    db_now = [datetime.now(timezone.utc).replace(hour=12)]
+    db = mock.MagicMock()
+    db.execute.return_value.scalar_one_or_none.return_value = None
+    db.execute.return_value.scalar_one.return_value = 0
+
+    with mock.patch.object(cache, "_aggregate", events.aggregate), \
+            mock.patch.object(cache, "_db_now", lambda db: db_now[0]):
+        events.rows.append((db_now[0] - timedelta(hours=1), db_now[0] - timedelta(minutes=1), "high", 10.0))
+        cache.refresh(db)
+        assert cache.current()["events_today"] == 1
+
+        # A sensor on a slow link uploads an event stamped an hour ago
+        events.rows.append((db_now[0] - timedelta(hours=1), db_now[0], "critical", 30.0))
+        db_now[0] += timedelta(minutes=1)
+        cache.refresh(db)
+
+    summary = cache.current()
+    assert summary["events_today"] == 2
+    assert summary["critical_today"] == 1
+    assert summary["avg_detection_latency_ms"] == 20.0
+
+
+@pytest.fixture
+def summary_client(monkeypatch):
+    cache = DashboardSummaryCache()
+    monkeypatch.setattr(dashboard, "dashboard_summary", cache)
+    app = FastAPI()
+    app.include_router(dashboard.router, prefix="/api/v1/dashboard")
+    test_client = TestClient(app)
+    test_client.cache = cache
+    return test_client
+
+
+def _event(ingested_at, severity="high", latency=10.0, timestamp=None, src_ip=None):
+    event = models.DetectionEvents(
+        event_id=uuid.uuid4(),
+        timestamp=timestamp or ingested_at,
+        ingested_at=ingested_at,
+        attack_type="port_scan",
+        confidence_score=0.8,
+        severity=severity,
+        model_name="rf",
+        processing_latency_ms=latency,
+    )
+    if src_ip:
+        event.traffic_features = [models.TrafficFeatures(
+            src_ip=src_ip, dst_ip="10.0.0.1", src_port=40000, dst_port=22, protocol="TCP",
+            packet_count=1, byte_count=60, packet_rate=1.0, flow_duration_ms=1.0,
+            avg_inter_arrival_time_ms=1.0, avg_packet_size=60.0, ttl_avg=64.0,
+        )]
+    return event
+
+
+def test_summary_is_503_until_the_first_refresh(summary_client, db_sessionmaker):
+    response = summary_client.get("/api/v1/dashboard/summary")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+    with db_sessionmaker() as db:
+        summary_client.cache.refresh(db)
+    assert summary_client.get("/api/v1/dashboard/summary").status_code == 200
+
+
+def test_summary_aggregates_todays_rows(summary_client, db_sessionmaker):
+    settled = datetime.now(timezone.utc) - timedelta(minutes=1)
+    with db_sessionmaker() as db:
+        db.add_all([
+            _event(settled, "high", 10.0, src_ip="10.0.0.5"),
+            _event(settled, "CRITICAL", 30.0, src_ip="10.0.0.6"),
+            _event(settled, "critical", 50.0, timestamp=settled - timedelta(days=1)),
+            models.DeviceHealthLogs(
+                cpu_usage_percent=42.0, memory_usage_percent=60.0, disk_usage_percent=70.0,
+                network_rx_bytes=1, network_tx_bytes=1,
+            ),
+        ])
+        db.commit()
+        summary_client.cache.refresh(db)
+
+    summary = summary_client.get("/api/v1/dashboard/summary").json()
+    assert summary["events_today"] == 2
+    assert summary["critical_today"] == 1
+    assert summary["avg_detection_latency_ms"] == 20.0
+    assert summary["active_sources"] == 2
+    assert summary["latest_device_health"]["cpu_usage_percent"] == 42.0
+
+
+def test_incremental_refresh_picks_up_late_uploads(summary_client, db_sessionmaker, monkeypatch):
+    settled = datetime.now(timezone.utc) - timedelta(minutes=1)
+    with db_sessionmaker() as db:
+        db.add(_event(settled))
+        db.commit()
+        summary_client.cache.refresh(db)
+        cursor = summary_client.cache._cursor
+
+        # Stamped by the sensor before the first refresh, inserted after it
+        db.add(_event(cursor + timedelta(seconds=1), "critical", 30.0, timestamp=settled))
+        db.commit()
+        # Let the cursor run ahead of the database clock so that row counts as settled
+        monkeypatch.setattr(dashboard_service, "INGEST_SETTLE", timedelta(seconds=-60))
+        summary_client.cache.refresh(db)
+
+    summary = summary_client.get("/api/v1/dashboard/summary").json()
+    assert summary["events_today"] == 2
+    assert summary["critical_today"] == 1
+
+
+def test_age_seconds_grows_until_the_next_refresh(summary_client, db_sessionmaker, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(dashboard_service.time, "monotonic", lambda: clock[0])
+    with db_sessionmaker() as db:
+        summary_client.cache.refresh(db)
+        clock[0] += 7
+        assert summary_client.get("/api/v1/dashboard/summary").json()["age_seconds"] == 7
+        summary_client.cache.refresh(db)
+    assert summary_client.get("/api/v1/dashboard/summary").json()["age_seconds"] == 0
@@ -0,0 +1,114 @@
+import itertools
+from types import SimpleNamespace
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app import database, models
+
+
+def _request(headers=None, host="10.0.0.1"):
+    return SimpleNamespace(headers=headers or {}, cookies={}, client=SimpleNamespace(host=host))
+
+
+def test_read_db_falls_back_to_primary_when_replica_checkout_fails(monkeypatch):
+    dead_engine = create_engine("sqlite:////nonexistent-dir/replica.db")
+    replica = {
+        "engine": dead_engine,
+        "sessionmaker": sessionmaker(bind=dead_engine),
+        "healthy": True,
+        "lag": 0.0,
+    }
+    router = database.ReplicaRouter([], max_lag=5, check_interval=5)
+    router.replicas = [replica]
+    router._cycle = iter([0] * 10)
+    primary = sessionmaker(bind=create_engine("sqlite://"))
+    monkeypatch.setattr(database, "replica_router", router)
+    monkeypatch.setattr(database, "SessionLocal", primary)
+
+    gen = database.get_read_db(_request())
+    db = next(gen)
+    assert db.get_bind() is primary.kw["bind"]
+    assert replica["healthy"] is False
+    gen.close()
+
+
+def test_read_your_writes_follows_the_client_across_workers(monkeypatch, db_sessionmaker):
+    replica_sessions = sessionmaker(bind=create_engine("sqlite://"))
+    router = database.ReplicaRouter([], max_lag=5, check_interval=5)
+    router.replicas = [{"engine": None, "sessionmaker": replica_sessions, "healthy": True, "lag": 0.0}]
+    router._cycle = itertools.cycle([0])
+    monkeypatch.setattr(database, "replica_router", router)
+    monkeypatch.setattr(database, "SessionLocal", db_sessionmaker)
+    monkeypatch.setattr(database, "READ_YOUR_WRITES_SECONDS", 5.0)
+
+    def worker():
+        app = FastAPI()
+        app.add_middleware(database.ReadYourWritesMiddleware)
+
+        @app.post("/write")
+        def write(db=Depends(database.get_db)):
+            db.add(models.SystemLogs(log_level="INFO", log_source="test", message="hello"))
+            db.commit()
+
+        @app.post("/noop")
+        def noop(db=Depends(database.get_db)):
+            pass
+
+        @app.get("/read")
+        def read(db=Depends(database.get_read_db)):
+            return {"primary": db.get_bind() is db_sessionmaker.kw["bind"]}
+
+        return app
+
+    client = TestClient(worker())
+    assert client.get("/read").json() == {"primary": False}
+    assert "set-cookie" not in client.post("/noop").headers
+    assert database.WRITE_COOKIE in client.post("/write").cookies
+
+    # The follow-up read lands on a worker that never saw the write
+    other_worker = TestClient(worker(), cookies=client.cookies)
+    assert other_worker.get("/read").json() == {"primary": True}
+    assert TestClient(worker()).get("/read").json() == {"primary": False}
+
+
+def test_replica_that_is_not_streaming_is_marked_down(monkeypatch):
+    router = database.ReplicaRouter([], max_lag=5, check_interval=5)
+    replica = {"engine": create_engine("sqlite://"), "healthy": True, "lag": 0.0}
+
+    # What REPLICATION_LAG_SQL returns once the WAL receiver has disconnected
+    monkeypatch.setattr(database, "REPLICATION_LAG_SQL", text("SELECT NULL"))
+    router.check(replica)
+    assert replica["healthy"] is False
+
+    monkeypatch.setattr(database, "REPLICATION_LAG_SQL", text("SELECT 1.5"))
+    router.check(replica)
+    assert replica["healthy"] is True
+    assert replica["lag"] == 1.5
+
+
+def test_replica_status_is_not_public():
+    from app.main import app
+
+    client = TestClient(app)
+    assert "read_replicas" not in client.get("/health").json()
+    assert client.get("/health/replicas").status_code == 401
+
+
+
+def test_primary_connections_use_the_connect_timeout(monkeypatch):
+    dbapi = database.engine.dialect.loaded_dbapi
+    attempts = []
+
+    def connect(*args, **kwargs):
+        attempts.append(kwargs)
+        raise dbapi.OperationalError("unreachable")
+
+    monkeypatch.setattr(dbapi, "connect", connect)
+    with pytest.raises(OperationalError):
+        database.engine.connect()
+    assert attempts[0]["connect_timeout"] == database.DB_CONNECT_TIMEOUT
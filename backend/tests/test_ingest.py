@@ -0,0 +1,266 @@
+import gzip
+import tracemalloc
+import uuid
+import zlib
+
+import msgpack
+import pytest
+import zstandard
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.exceptions import HTTPException
+
+from app import models
+from app.api.deps import get_current_sensor
+from app.api.endpoints import device_health, ingest
+from app.database import get_db
+from app.utils import content_encoding, security
+from app.utils.content_encoding import DecompressionMiddleware, _ZstdDecoder
+
+EVENT = {
+    "event_id": str(uuid.uuid4()),
+    "attack_type": "ddos",
+    "confidence_score": 0.9,
+    "severity": "high",
+    "model_name": "rf",
+    "processing_latency_ms": 3.2,
+}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    committed = []
+    monkeypatch.setattr(ingest, "create_sensor_batch", lambda db, batch: committed.append(batch))
+    app = FastAPI()
+    app.add_middleware(DecompressionMiddleware)
+    app.include_router(ingest.router, prefix="/api/v1/ingest")
+    app.dependency_overrides[get_db] = lambda: None
+    app.dependency_overrides[get_current_sensor] = lambda: "sensor-a"
+    test_client = TestClient(app)
+    test_client.committed = committed
+    return test_client
+
+
+def test_msgpack_batch_is_ingested(client):
+    body = msgpack.packb(["detection_event", EVENT]) * 2
+    response = client.post(
+        "/api/v1/ingest/batch",
+        content=zstandard.ZstdCompressor().compress(body),
+        headers={"Content-Type": "application/msgpack", "Content-Encoding": "zstd"},
+    )
+    assert response.status_code == 200
+    assert len(client.committed[0].detection_events) == 2
+
+
+def test_truncated_msgpack_record_is_rejected(client):
+    body = msgpack.packb(["detection_event", EVENT]) * 2
+    response = client.post(
+        "/api/v1/ingest/batch",
+        content=body[:-2],
+        headers={"Content-Type": "application/msgpack"},
+    )
+    assert response.status_code == 400
+    assert "Truncated" in response.json()["detail"]
+    assert client.committed == []
+
+
+def _cut_after_first_record(compressobj, flush_mode):
+    """Compress four records and keep only the output up to a flush after the first."""
+    record = msgpack.packb(["detection_event", EVENT])
+    head = compressobj.compress(record) + compressobj.flush(flush_mode)
+    compressobj.compress(record * 3)
+    return head
+
+
+def test_truncated_gzip_body_is_rejected(client):
+    gzip_obj = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    response = client.post(
+        "/api/v1/ingest/batch",
+        content=_cut_after_first_record(gzip_obj, zlib.Z_FULL_FLUSH),
+        headers={"Content-Type": "application/msgpack", "Content-Encoding": "gzip"},
+    )
+    assert response.status_code == 400
+    assert client.committed == []
+
+
+def test_truncated_zstd_body_is_rejected(client):
+    zstd_obj = zstandard.ZstdCompressor().compressobj()
+    response = client.post(
+        "/api/v1/ingest/batch",
+        content=_cut_after_first_record(zstd_obj, zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+        headers={"Content-Type": "application/msgpack", "Content-Encoding": "zstd"},
+    )
+    assert response.status_code == 400
+    assert client.committed == []
+
+
+def test_zstd_bomb_is_stopped_without_inflating_it():
+    bomb = zstandard.ZstdCompressor().compress(b"\0" * (256 << 20))
+    tracemalloc.start()
+    try:
+        with pytest.raises(HTTPException) as exc:
+            _ZstdDecoder().decompress(bomb, 1 << 20)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert exc.value.status_code == 413
+    assert peak < 8 << 20
+
+
+def test_oversized_bodies_are_rejected(client, monkeypatch):
+    monkeypatch.setattr(content_encoding, "MAX_INGEST_BODY_BYTES", 1024)
+    payload = b'{"detection_events": [' + b" " * 2048 + b"]}"
+
+    plain = client.post("/api/v1/ingest/batch", content=payload, headers={"Content-Type": "application/json"})
+    assert plain.status_code == 413
+
+    compressed = client.post(
+        "/api/v1/ingest/batch",
+        content=gzip.compress(payload),
+        headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+    )
+    assert compressed.status_code == 413
+    assert client.committed == []
+
+
+FEATURES = {
+    "src_ip": "10.0.0.5",
+    "dst_ip": "10.0.0.1",
+    "src_port": 51000,
+    "dst_port": 443,
+    "protocol": "TCP",
+    "packet_count": 120,
+    "byte_count": 90000,
+    "packet_rate": 40.0,
+    "flow_duration_ms": 3000.0,
+    "avg_inter_arrival_time_ms": 25.0,
+    "avg_packet_size": 750.0,
+    "ttl_avg": 64.0,
+}
+
+
+def _detection(**overrides):
+    detection = {
+        **{k: v for k, v in EVENT.items() if k != "event_id"},
+        "traffic_features": [FEATURES],
+        "event_context": [{"src_mac": "aa:bb:cc:dd:ee:01", "dst_mac": "aa:bb:cc:dd:ee:02"}],
+        "system_logs": [{"log_level": "WARNING", "log_source": "edge", "message": "flow flagged"}],
+    }
+    return {**detection, **overrides}
+
+
+@pytest.fixture
+def db_client(db_sessionmaker):
+    def get_test_db():
+        db = db_sessionmaker()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(ingest.router, prefix="/api/v1/ingest")
+    app.dependency_overrides[get_db] = get_test_db
+    app.dependency_overrides[get_current_sensor] = lambda: "sensor-a"
+    test_client = TestClient(app)
+    test_client.db = db_sessionmaker()
+    yield test_client
+    test_client.db.close()
+
+
+def test_detection_children_take_the_client_supplied_event_id(db_client):
+    event_id = str(uuid.uuid4())
+    response = db_client.post("/api/v1/ingest/detections", json=_detection(event_id=event_id))
+
+    assert response.status_code == 200
+    assert response.json()["event_id"] == event_id
+    event = db_client.db.get(models.DetectionEvents, uuid.UUID(event_id))
+    assert len(event.traffic_features) == len(event.event_context) == len(event.system_logs) == 1
+    assert event.traffic_features[0].event_id == event.event_id
+    assert event.event_context[0].event_id == event.event_id
+    assert event.system_logs[0].event_id == event.event_id
+
+
+def test_detection_batch_links_each_child_to_its_own_event(db_client):
+    response = db_client.post(
+        "/api/v1/ingest/detections/batch",
+        json=[_detection(event_id=str(uuid.uuid4())), _detection()],
+    )
+
+    assert response.status_code == 200
+    event_ids = [uuid.UUID(i) for i in response.json()["event_ids"]]
+    assert len(set(event_ids)) == 2
+    for event_id in event_ids:
+        features = db_client.db.query(models.TrafficFeatures).filter_by(event_id=event_id).all()
+        assert len(features) == 1
+
+
+def test_one_bad_child_rolls_back_the_whole_batch(db_client):
+    feature = {**FEATURES, "feature_id": str(uuid.uuid4())}
+    response = db_client.post(
+        "/api/v1/ingest/detections/batch",
+        json=[_detection(traffic_features=[feature]), _detection(traffic_features=[feature])],
+    )
+
+    assert response.status_code == 409
+    for model in (models.DetectionEvents, models.TrafficFeatures, models.EventContext, models.SystemLogs):
+        assert db_client.db.query(model).count() == 0
+
+
+def test_retried_detection_is_a_conflict_not_a_server_error(db_client):
+    detection = _detection(event_id=str(uuid.uuid4()))
+    assert db_client.post("/api/v1/ingest/detections", json=detection).status_code == 200
+
+    retry = db_client.post("/api/v1/ingest/detections", json=detection)
+
+    assert retry.status_code == 409
+    assert "IntegrityError" not in retry.json()["detail"]
+    assert db_client.db.query(models.DetectionEvents).count() == 1
+
+
+@pytest.fixture
+def keyed_client(db_sessionmaker, monkeypatch):
+    """The real sensor API key check, with one known key "key-a" for "sensor-a"."""
+    monkeypatch.setattr(security, "SENSOR_KEY_DIGESTS", {security.hash_api_key("key-a"): "sensor-a"})
+
+    def get_test_db():
+        db = db_sessionmaker()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(ingest.router, prefix="/api/v1/ingest")
+    app.include_router(device_health.router, prefix="/api/v1/device-health-logs")
+    app.dependency_overrides[get_db] = get_test_db
+    return TestClient(app)
+
+
+HEALTH = {
+    "cpu_usage_percent": 12.0,
+    "memory_usage_percent": 40.0,
+    "disk_usage_percent": 55.0,
+    "network_rx_bytes": 1024,
+    "network_tx_bytes": 2048,
+}
+
+
+@pytest.mark.parametrize("path, body", [
+    ("/api/v1/ingest/batch", {"detection_events": [EVENT]}),
+    ("/api/v1/device-health-logs", HEALTH),
+])
+@pytest.mark.parametrize("headers", [{}, {"X-API-Key": "unknown"}])
+def test_sensor_routes_reject_missing_or_unknown_keys(keyed_client, path, body, headers):
+    response = keyed_client.post(path, json=body, headers=headers)
+    assert response.status_code == 401
+    assert response.headers["WWW-Authenticate"] == "ApiKey"
+
+
+@pytest.mark.parametrize("path, body", [
+    ("/api/v1/ingest/batch", {"detection_events": [{**EVENT, "event_id": str(uuid.uuid4())}]}),
+    ("/api/v1/device-health-logs", HEALTH),
+])
+def test_sensor_routes_accept_a_valid_key(keyed_client, path, body):
+    response = keyed_client.post(path, json=body, headers={"X-API-Key": "key-a"})
+    assert response.status_code == 200
@@ -0,0 +1,191 @@
+import asyncio
+
+import pytest
+
+from app.config import ROLE_RATE_LIMITS
+from app.utils import rate_limit, security
+from app.utils.rate_limit import InMemoryTokenBuckets, RateLimitMiddleware, RedisTokenBuckets
+from app.utils.security import create_access_token
+
+
+def test_prune_uses_each_buckets_own_refill_time(monkeypatch):
+    monkeypatch.setattr(rate_limit, "_MAX_BUCKETS", 2)
+    buckets = InMemoryTokenBuckets()
+    clock = [100.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: clock[0])
+
+    async def scenario():
+        # Sensor bucket refills in 4s, anonymous in 2s
+        for _ in range(200):
+            await buckets.hit("sensor:a", 50.0, 200)
+        await buckets.hit("ip:1", 5.0, 10)
+        clock[0] += 3.0
+        # An anonymous caller triggers the prune; the sensor is only partly refilled
+        await buckets.hit("ip:2", 5.0, 10)
+        return await buckets.hit("sensor:a", 50.0, 200)
+
+    asyncio.run(scenario())
+    assert "ip:1" not in buckets._buckets
+    assert buckets._buckets["sensor:a"][0] < 199
+
+
+def test_bucket_count_is_capped_when_all_are_refilling(monkeypatch):
+    monkeypatch.setattr(rate_limit, "_MAX_BUCKETS", 3)
+    buckets = InMemoryTokenBuckets()
+
+    async def scenario():
+        for i in range(10):
+            await buckets.hit(f"ip:{i}", 1.0, 10)
+
+    asyncio.run(scenario())
+    assert len(buckets._buckets) == 3
+
+
+def test_role_limits_come_from_config():
+    assert rate_limit.ROLE_RATE_LIMITS is ROLE_RATE_LIMITS
+    assert ROLE_RATE_LIMITS["analyst"] == (20.0, 40)
+
+
+async def _ok(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+def _scope(method="GET", path="/api/v1/detection-events", headers=(), client="10.0.0.1"):
+    return {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "headers": [(k.encode(), v.encode()) for k, v in headers],
+        "client": (client, 50000),
+    }
+
+
+async def _call(app, scope):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    start = sent[0]
+    return start["status"], dict(start["headers"])
+
+
+@pytest.fixture
+def fresh_buckets(monkeypatch):
+    monkeypatch.setattr(rate_limit, "buckets", InMemoryTokenBuckets())
+    monkeypatch.setattr(security, "SENSOR_KEY_DIGESTS", {security.hash_api_key("key-a"): "sensor-a"})
+
+
+def test_over_limit_caller_gets_429_with_retry_after(fresh_buckets, monkeypatch):
+    monkeypatch.setattr(rate_limit, "ANONYMOUS_RATE_LIMIT", (0.5, 2))
+    app = RateLimitMiddleware(_ok)
+
+    async def scenario():
+        return [await _call(app, _scope()) for _ in range(3)]
+
+    results = asyncio.run(scenario())
+    assert [status for status, _ in results] == [200, 200, 429]
+    assert results[2][1][b"retry-after"] == b"2"
+
+
+def test_saturated_route_class_gets_503(fresh_buckets, monkeypatch):
+    monkeypatch.setitem(rate_limit.CONCURRENCY_LIMITS, "read", 1)
+
+    async def scenario():
+        gate = asyncio.Event()
+
+        async def slow_reads(scope, receive, send):
+            if scope["method"] == "GET":
+                await gate.wait()
+            await _ok(scope, receive, send)
+
+        app = RateLimitMiddleware(slow_reads)
+        first = asyncio.create_task(_call(app, _scope()))
+        await asyncio.sleep(0)
+        second = await _call(app, _scope(client="10.0.0.2"))
+        # Other route classes keep their own caps
+        ingest = await _call(app, _scope(method="POST", path="/api/v1/ingest/batch"))
+        gate.set()
+        return second, await first, ingest
+
+    second, first, ingest = asyncio.run(scenario())
+    assert second[0] == 503
+    assert second[1][b"retry-after"] == b"1"
+    assert first[0] == 200
+    assert ingest[0] == 200
+
+
+def test_callers_are_keyed_by_sensor_user_then_address(fresh_buckets):
+    token = create_access_token({"sub": "alice", "role": "analyst"})
+    bearer = ("authorization", f"Bearer {token}")
+    api_key = ("x-api-key", "key-a")
+
+    sensor = rate_limit.identify(_scope("POST", "/api/v1/ingest/batch", [api_key]), "ingest")
+    assert sensor == ("sensor:sensor-a", *rate_limit.SENSOR_RATE_LIMIT)
+
+    # Sensor keys only count on ingest routes, and unknown keys fall through
+    assert rate_limit.identify(_scope(headers=[api_key]), "read")[0] == "ip:10.0.0.1"
+    unknown = _scope("POST", "/api/v1/ingest/batch", [("x-api-key", "nope")])
+    assert rate_limit.identify(unknown, "ingest")[0] == "ip:10.0.0.1"
+
+    user = rate_limit.identify(_scope(headers=[bearer]), "read")
+    assert user == ("user:alice", *ROLE_RATE_LIMITS["analyst"])
+
+    anonymous = rate_limit.identify(_scope(headers=[("authorization", "Bearer junk")]), "read")
+    assert anonymous == ("ip:10.0.0.1", *rate_limit.ANONYMOUS_RATE_LIMIT)
+
+
+def test_buckets_are_separate_per_caller(fresh_buckets, monkeypatch):
+    monkeypatch.setattr(rate_limit, "ANONYMOUS_RATE_LIMIT", (0.5, 1))
+    monkeypatch.setattr(rate_limit, "SENSOR_RATE_LIMIT", (0.5, 1))
+    app = RateLimitMiddleware(_ok)
+    ingest = ("POST", "/api/v1/ingest/batch")
+
+    async def scenario():
+        return [
+            await _call(app, _scope()),
+            await _call(app, _scope()),
+            # Same address, but a sensor has its own bucket
+            await _call(app, _scope(*ingest, [("x-api-key", "key-a")])),
+            await _call(app, _scope(client="10.0.0.2")),
+        ]
+
+    assert [status for status, _ in asyncio.run(scenario())] == [200, 429, 200, 200]
+
+
+def test_token_cache_never_stores_the_token(monkeypatch):
+    monkeypatch.setattr(rate_limit, "_token_claims", {})
+    token = create_access_token({"sub": "alice", "role": "analyst"})
+
+    assert rate_limit._claims_for(token)["sub"] == "alice"
+    assert token not in rate_limit._token_claims
+    assert all(token.encode() not in key for key in rate_limit._token_claims)
+    assert rate_limit._claims_for(token)["sub"] == "alice"
+
+
+def test_redis_outage_is_logged_once(capsys):
+    outcomes = [ConnectionError("down"), ConnectionError("down"), (1, "5"), ConnectionError("down")]
+
+    async def script(keys, args):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    redis_buckets = RedisTokenBuckets.__new__(RedisTokenBuckets)
+    redis_buckets._script = script
+    redis_buckets._fallback = InMemoryTokenBuckets()
+    redis_buckets._down = False
+
+    async def scenario():
+        return [(await redis_buckets.hit("ip:1", 1.0, 10))[0] for _ in range(4)]
+
+    assert asyncio.run(scenario()) == [True] * 4
+    logged = capsys.readouterr().out
+    assert logged.count("unavailable") == 2
+    assert logged.count("recovered") == 1
@@ -0,0 +1,47 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import main
+from app.utils import startup_profile
+from app.utils.startup_profile import FirstRequestMiddleware, startup_report
+
+
+def test_first_response_reports_first_request(monkeypatch):
+    monkeypatch.setattr(startup_profile, "_marks", {})
+    app = FastAPI()
+    app.add_middleware(FirstRequestMiddleware)
+
+    @app.get("/health")
+    def health():
+        return startup_report()
+
+    body = TestClient(app).get("/health").json()
+
+    assert "first_request_ms" in body
+    assert body["total_from"] == "first_request"
+    assert "first_response" in startup_profile._marks
+
+
+def test_lifespan_waits_for_background_tasks_to_stop(monkeypatch):
+    stopped = []
+
+    async def loop(name):
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await asyncio.sleep(0)
+            stopped.append(name)
+
+    monkeypatch.setattr(main, "DB_INIT_ON_STARTUP", False)
+    monkeypatch.setattr(main, "run_replica_health_checks", lambda: loop("replicas"))
+    monkeypatch.setattr(main, "run_dashboard_refresh", lambda: loop("dashboard"))
+
+    async def run():
+        async with main.lifespan(main.app):
+            await asyncio.sleep(0)
+
+    asyncio.run(run())
+
+    assert sorted(stopped) == ["dashboard", "replicas"]
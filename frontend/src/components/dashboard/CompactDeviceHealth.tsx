@@ -1,32 +1,45 @@
 import React from 'react';
 import { Link } from 'react-router-dom';
+import type { DashboardSummary } from '../../services/api';
 
-interface CompactDeviceHealth {
+interface CompactDeviceHealthProps {
+  health: DashboardSummary['latest_device_health'];
+}
+
+interface CompactResourceUsage {
   name: string;
-  status: 'online' | 'warning' | 'offline';
+  percent: number;
 }
 
-export const CompactDeviceHealth: React.FC = () => {
-  const devices: CompactDeviceHealth[] = [
-    { name: 'Feature Extractor', status: 'online' },
-    { name: 'Edge ML Device', status: 'online' },
-    { name: 'Cloud DL Model', status: 'online' },
-  ];
+export const CompactDeviceHealth: React.FC<CompactDeviceHealthProps> = ({ health }) => {
+  const resources: CompactResourceUsage[] = health
+    ? [
+        { name: 'CPU', percent: health.cpu_usage_percent },
+        { name: 'Memory', percent: health.memory_usage_percent },
+        { name: 'Disk', percent: health.disk_usage_percent },
+      ]
+    : [];
+
+  const getStatus = (percent: number) => {
+    if (percent >= 90) return 'critical';
+    if (percent >= 75) return 'warning';
+    return 'normal';
+  };
 
   const getStatusColor = (status: string) => {
     const colors = {
-      online: 'bg-green-500',
+      normal: 'bg-green-500',
       warning: 'bg-yellow-500',
-      offline: 'bg-red-500',
+      critical: 'bg-red-500',
     };
     return colors[status as keyof typeof colors];
   };
 
   const getStatusText = (status: string) => {
     const text = {
-      online: 'text-green-700 dark:text-green-400',
+      normal: 'text-green-700 dark:text-green-400',
       warning: 'text-yellow-700 dark:text-yellow-400',
-      offline: 'text-red-700 dark:text-red-400',
+      critical: 'text-red-700 dark:text-red-400',
     };
     return text[status as keyof typeof text];
   };
@@ -40,19 +53,29 @@ export const CompactDeviceHealth: React.FC = () => {
         </Link>
       </div>
 
-      <div className="space-y-2">
-        {devices.map((device, idx) => (
-          <div key={idx} className="flex items-center justify-between">
-            <div className="flex items-center space-x-2">
-              <div className={`w-2 h-2 rounded-full ${getStatusColor(device.status)}`}></div>
-              <span className="text-sm text-gray-900 dark:text-white">{device.name}</span>
-            </div>
-            <span className={`text-xs font-medium uppercase ${getStatusText(device.status)}`}>
-              {device.status}
-            </span>
-          </div>
-        ))}
-      </div>
+      {health ? (
+        <div className="space-y-2">
+          {resources.map((resource) => {
+            const status = getStatus(resource.percent);
+            return (
+              <div key={resource.name} className="flex items-center justify-between">
+                <div className="flex items-center space-x-2">
+                  <div className={`w-2 h-2 rounded-full ${getStatusColor(status)}`}></div>
+                  <span className="text-sm text-gray-900 dark:text-white">{resource.name}</span>
+                </div>
+                <span className={`text-xs font-medium ${getStatusText(status)}`}>
+                  {resource.percent.toFixed(0)}%
+                </span>
+              </div>
+            );
+          })}
+          <p className="text-xs text-gray-500 dark:text-gray-400">
+            Reported {new Date(health.timestamp).toLocaleTimeString()}
+          </p>
+        </div>
+      ) : (
+        <p className="text-sm text-gray-500 dark:text-gray-400">No device health reported yet</p>
+      )}
     </div>
   );
 };
@@ -1,11 +1,44 @@
-import React from 'react';
+import React, { useState, useEffect } from 'react';
+import { dashboardAPI } from '../services/api';
+import type { DashboardSummary } from '../services/api';
 import { CompactMetricCard } from '../components/dashboard/CompactMetricCard';
 import { CompactPacketMonitor } from '../components/dashboard/CompactPacketMonitor';
 import { MiniTrafficChart } from '../components/dashboard/MiniTrafficChart';
 import { MiniAttackTimeline } from '../components/dashboard/MiniAttackTimeline';
 import { CompactDeviceHealth } from '../components/dashboard/CompactDeviceHealth';
 
+// Snapshots older than this mean the backend refresh loop has stalled
+const SUMMARY_STALE_SECONDS = 60;
+
 export const DashboardPage: React.FC = () => {
+  const [summary, setSummary] = useState<DashboardSummary | null>(null);
+  const [summaryError, setSummaryError] = useState<'not_ready' | 'unavailable' | null>(null);
+
+  // One cheap request per refresh; the backend serves a precomputed snapshot
+  useEffect(() => {
+    const load = () => {
+      dashboardAPI.getSummary()
+        .then((res) => {
+          setSummary(res.data);
+          setSummaryError(null);
+        })
+        .catch((error: any) => {
+          // 503 means the first snapshot has not been computed yet
+          setSummaryError(error.response?.status === 503 ? 'not_ready' : 'unavailable');
+        });
+    };
+    load();
+    const interval = setInterval(load, 10000);
+    return () => clearInterval(interval);
+  }, []);
+
+  // Keep showing the last snapshot on failure, but say it may be out of date
+  const summaryStatus =
+    summaryError === 'not_ready' ? 'Dashboard warming up'
+    : summaryError === 'unavailable' ? (summary ? 'Dashboard data stale' : 'Dashboard data unavailable')
+    : summary && summary.age_seconds > SUMMARY_STALE_SECONDS ? 'Dashboard data stale'
+    : null;
+
   return (
     <div className="h-full flex flex-col space-y-4 overflow-hidden">
       {/* Page Header - Compact */}
@@ -15,17 +48,50 @@ export const DashboardPage: React.FC = () => {
           <p className="text-xs text-gray-500 dark:text-gray-400">Real-time monitoring</p>
         </div>
         <div className="flex items-center space-x-2 text-xs">
-          <div className="w-2 h-2 bg-green-500 rounded-full animate-pulse"></div>
-          <span className="text-green-600 dark:text-green-400 font-medium">All Systems Operational</span>
+          {summaryStatus ? (
+            <>
+              <div className="w-2 h-2 bg-yellow-500 rounded-full"></div>
+              <span className="text-yellow-600 dark:text-yellow-400 font-medium">{summaryStatus}</span>
+            </>
+          ) : (
+            <>
+              <div className="w-2 h-2 bg-green-500 rounded-full animate-pulse"></div>
+              <span className="text-green-600 dark:text-green-400 font-medium">All Systems Operational</span>
+            </>
+          )}
+          {summary && (
+            <span className="text-gray-500 dark:text-gray-400">
+              · Updated {Math.round(summary.age_seconds)}s ago
+            </span>
+          )}
         </div>
       </div>
 
-      {/* Key Metrics Row - 2 compact cards, centered with max width */}
+      {/* Key Metrics Row - compact cards, centered with max width */}
       <div className="flex justify-center">
-        <div className="grid grid-cols-2 gap-6 max-w-2xl w-full">
+        <div className="grid grid-cols-5 gap-6 max-w-5xl w-full">
+          <CompactMetricCard
+            title="Events Today"
+            value={summary?.events_today ?? '—'}
+            status="healthy"
+          />
+
+          <CompactMetricCard
+            title="Critical Today"
+            value={summary?.critical_today ?? '—'}
+            status={summary && summary.critical_today > 0 ? 'critical' : 'healthy'}
+          />
+
+          <CompactMetricCard
+            title="Avg Detection Latency"
+            value={summary?.avg_detection_latency_ms != null ? summary.avg_detection_latency_ms.toFixed(1) : '—'}
+            unit="ms"
+            status="healthy"
+          />
+
           <CompactMetricCard
-            title="Total Devices"
-            value="24"
+            title="Active Sources"
+            value={summary?.active_sources ?? '—'}
             status="healthy"
             icon={
               <svg className="w-5 h-5" fill="none" stroke="currentColor" viewBox="0 0 24 24">
@@ -56,7 +122,7 @@ export const DashboardPage: React.FC = () => {
 
         {/* Middle Column - Device Health and Traffic Chart */}
         <div className="col-span-1 flex flex-col space-y-4">
-          <CompactDeviceHealth />
+          <CompactDeviceHealth health={summary?.latest_device_health ?? null} />
           <div className="flex-1">
             <MiniTrafficChart />
           </div>
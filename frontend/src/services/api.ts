@@ -5,6 +5,8 @@ const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000
 const api = axios.create({
   baseURL: API_BASE_URL,
   headers: { 'Content-Type': 'application/json' },
+  // Sends the backend's last_write cookie so reads right after a write skip the replicas
+  withCredentials: true,
 });
 
 api.interceptors.request.use((config) => {
@@ -31,4 +33,23 @@ export const authAPI = {
   getMe: () => api.get('/auth/me'),
 };
 
+export interface DashboardSummary {
+  events_today: number;
+  critical_today: number;
+  avg_detection_latency_ms: number | null;
+  active_sources: number;
+  latest_device_health: {
+    cpu_usage_percent: number;
+    memory_usage_percent: number;
+    disk_usage_percent: number;
+    timestamp: string;
+  } | null;
+  computed_at: string;
+  age_seconds: number;
+}
+
+export const dashboardAPI = {
+  getSummary: () => api.get<DashboardSummary>('/dashboard/summary'),
+};
+
 export default api;
\ No newline at end of file